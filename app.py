@@ -1,15 +1,26 @@
 import os
-import json
+
+# Must happen before anything imports socket/ssl; enabled by the gunicorn
+# gevent entrypoint in start.sh.
+if os.getenv("GEVENT"):
+    from gevent import monkey
+    monkey.patch_all()
+
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+import orjson
 import pandas as pd
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from dotenv import load_dotenv
 from bs4 import BeautifulSoup
 
 from pylon_client import PylonClient
 from omni_client import OmniClient
 from typesense_client import TypesenseClient
-from domain_utils import load_domain_sets, extract_weighted_domain_ngrams
+from domain_utils import load_domain_sets, extract_weighted_domain_ngrams, load_json_cached
 from pylon_client import PylonClient, PylonComponents
 
 # --- Setup ---
@@ -31,18 +42,68 @@ if not PYLON_API_KEY:
 # --- Load resources ---
 domain_keywords, domain_phrases = load_domain_sets("domain_keywords.json")
 
-with open("query.json", "r") as f:
-    QUERY_TEMPLATE = json.load(f)
+_ACCOUNT_FILTER = "pylon__pylon_issues.account_id"
+
+def _freeze_template(template):
+    """Wrap the levels of the template that _build_sf_query rebuilds in
+    read-only views, so nothing can mutate the shared structure between
+    requests. Untouched subtrees stay plain dicts (they are serialized
+    as-is)."""
+    filters = dict(template["query"]["filters"])
+    filters[_ACCOUNT_FILTER] = MappingProxyType(filters[_ACCOUNT_FILTER])
+    query = {**template["query"], "filters": MappingProxyType(filters)}
+    return MappingProxyType({**template, "query": MappingProxyType(query)})
+
+QUERY_TEMPLATE = _freeze_template(load_json_cached("query.json"))
+
+# The template's field list is the render allow-list; anything else Omni
+# sends back is dropped before the component loop sees it.
+_OMNI_OUTPUT_COLS = frozenset(QUERY_TEMPLATE["query"]["fields"])
+
+def _build_sf_query(account_id):
+    """Clone only the subtrees of QUERY_TEMPLATE that get mutated.
+
+    The template itself is treated as read-only; everything outside the
+    account-id filter is shared structurally, so we avoid the old
+    json.loads(json.dumps(...)) round-trip per request.
+    """
+    template_query = QUERY_TEMPLATE["query"]
+    filters = {
+        **template_query["filters"],
+        _ACCOUNT_FILTER: {
+            **template_query["filters"][_ACCOUNT_FILTER],
+            "values": [account_id],
+        },
+    }
+    return {**QUERY_TEMPLATE, "query": {**template_query, "filters": filters}}
 
 # --- Clients ---
 pylon = PylonClient(PYLON_API_KEY)
 omni = OmniClient(OMNI_API_KEY, OMNI_BASE_URL)
 typesense = TypesenseClient(TYPESENSE_BASE_URL, TYPESENSE_API_KEY)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Serialize jsonify responses with orjson instead of stdlib json."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 components_helper = PylonComponents()
 
+# Runs the Omni query concurrently with the Pylon/Typesense pipeline.
+# Sized to the gunicorn --worker-connections budget so concurrent requests
+# never queue behind the pool: under the gevent entrypoint these workers
+# are greenlets (monkey-patched threading), and they are only created on
+# demand, so the dev server doesn't pay for idle threads either.
+executor = ThreadPoolExecutor(max_workers=1000)
+
 @app.route('/', methods=['GET'])
 def root():
     req_type = request.args.get('request_type')
@@ -55,10 +116,30 @@ def root():
             account_id = request.args.get('account_id')
             issue_id = request.args.get('issue_id')
 
-            # --- Step 1: Omni query (unchanged) ---
-            sf_query = json.loads(json.dumps(QUERY_TEMPLATE))
-            sf_query["query"]["filters"]["pylon__pylon_issues.account_id"]["values"] = [account_id]
-            df = omni.run_query(sf_query)
+            # --- Step 1: kick off the Omni query in the background ---
+            sf_query = _build_sf_query(account_id)
+            # Only the first row is rendered, so skip converting the rest.
+            omni_future = executor.submit(omni.run_query, sf_query, first_row_only=True)
+
+            # --- Step 2: related-docs pipeline while Omni runs ---
+            components = []
+            if issue_id:
+                components.extend(
+                    components_helper.issue_related_docs(
+                        issue_id=issue_id,
+                        pylon_client=pylon,
+                        typesense_client=typesense,
+                        extract_weighted_domain_ngrams=extract_weighted_domain_ngrams,
+                        domain_keywords=domain_keywords,
+                        domain_phrases=domain_phrases,
+                        max_links=4,
+                    )
+                )
+
+            df = omni_future.result()
+            extra_cols = [c for c in df.columns if c not in _OMNI_OUTPUT_COLS]
+            if extra_cols:
+                df = df.drop(columns=extra_cols)
 
             if df.empty:
                 return jsonify({
@@ -68,19 +149,12 @@ def root():
                     "message": f"No records found for account_id={account_id}"
                 }), 404
 
-            row = df.iloc[0]
-
-            # --- Step 2: Build components via Pylon module helper ---
-            components = components_helper.assemble_issue_plus_row_components(
-                issue_id=issue_id,
-                pylon_client=pylon,
-                typesense_client=typesense,
-                extract_weighted_domain_ngrams=extract_weighted_domain_ngrams,
-                domain_keywords=domain_keywords,
-                domain_phrases=domain_phrases,
-                omni_row=row,
-                max_links=4,
-            )
+            # Materialize the first row once as plain Python values; avoids a
+            # pandas label lookup (and Series boxing) per column downstream.
+            row = dict(zip(df.columns, next(df.itertuples(index=False, name=None))))
+
+            # --- Step 3: append the account fields ---
+            components.extend(components_helper.row_to_components(row))
 
             return jsonify({
                 "version": "1.0.0",
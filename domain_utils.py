@@ -1,11 +1,37 @@
-import json
+import os
 import re
-from sklearn.feature_extraction.text import TfidfVectorizer
+from collections import Counter
 
-STOPWORDS = set("""
+import ahocorasick
+import numpy as np
+import orjson
+
+# Parsed JSON files keyed by path, with the mtime they were read at.
+_JSON_CACHE = {}
+
+def load_json_cached(path):
+    """Parse a JSON file once per mtime; re-parses only when the file changes."""
+    mtime = os.stat(path).st_mtime_ns
+    entry = _JSON_CACHE.get(path)
+    if entry and entry[0] == mtime:
+        return entry[1]
+    with open(path, "rb") as f:
+        value = orjson.loads(f.read())
+    _JSON_CACHE[path] = (mtime, value)
+    return value
+
+STOPWORDS = frozenset("""
 a about above after again am an and are as at be because been before being below but by can did do does doing down further had has have having he her here hers herself him himself his how i ideally if in is it its itself just me my myself no nor not of on or other our ours ourselves out own same she should so some such than that the their theirs them themselves then there these they this those through to too under until up very was we were what when where which while who whom why will with you your yours yourself yourselves please thanks hi hello regards note see ask wanted should could would know let make get new set use work issue show think look found question want need help appreciate attached sent send sending replied reply replying regards sincerely best
 """.split())
 
+_TOKEN_RE = re.compile(r"\b\w+\b")
+
+# Matcher state built once per vocabulary (at load_domain_sets time); the
+# vocabulary is fixed at startup, so requests only pay for a single scan.
+_AUTOMATON = None
+_IDF = None
+_VOCAB = None
+
 def flatten_and_filter_keywords(keyword_list, stopwords):
     flat_keywords = set()
     for item in keyword_list:
@@ -21,32 +47,57 @@ def flatten_and_filter_phrases(phrase_list, stopwords):
     flat_phrases = set()
     for item in phrase_list:
         if isinstance(item, str):
-            if not any(w in stopwords for w in item.split()):
+            if stopwords.isdisjoint(item.split()):
                 flat_phrases.add(item)
         elif isinstance(item, list) and item and isinstance(item[0], str):
-            if not any(w in stopwords for w in item[0].split()):
+            if stopwords.isdisjoint(item[0].split()):
                 flat_phrases.add(item[0])
     return flat_phrases
 
+def _build_matcher(vocab):
+    automaton = ahocorasick.Automaton()
+    for i, term in enumerate(vocab):
+        automaton.add_word(term.lower(), (i, term))
+    automaton.make_automaton()
+    # A document frequency of 1 per term reproduces sklearn's smooth_idf
+    # (log((1+n)/(1+df)) + 1) fitted on a single document.
+    idf = np.log((1 + 1) / (1 + np.ones(len(vocab)))) + 1
+    return automaton, idf
+
 def load_domain_sets(path):
-    with open(path, "r") as f:
-        data = json.load(f)
+    global _AUTOMATON, _IDF, _VOCAB
+    data = load_json_cached(path)
     keywords = flatten_and_filter_keywords(data.get("keywords", []), STOPWORDS)
     phrases = flatten_and_filter_phrases(data.get("phrases", []), STOPWORDS)
+    _VOCAB = sorted(keywords | phrases)
+    _AUTOMATON, _IDF = _build_matcher(_VOCAB)
     return keywords, phrases
 
 def extract_keywords(text, min_len=3, stopwords=STOPWORDS):
-    tokens = re.findall(r'\b\w+\b', text.lower())
-    return [t for t in tokens if t not in stopwords and len(t) >= min_len]
-
-def extract_weighted_domain_ngrams(text, domain_keywords, domain_phrases, ngram_sizes=(3,2,1)):
-    vocabulary = list(domain_keywords | domain_phrases)
-    vectorizer = TfidfVectorizer(
-        ngram_range=(1, max(ngram_sizes)),
-        stop_words=None,
-        vocabulary=vocabulary
-    )
-    tfidf_matrix = vectorizer.fit_transform([text.lower()])
-    feature_names = vectorizer.get_feature_names_out()
-    tfidf_scores = tfidf_matrix.toarray()[0]
-    return {feature_names[i]: tfidf_scores[i] for i in range(len(feature_names)) if tfidf_scores[i] > 0}
+    tokens = _TOKEN_RE.findall(text.lower())
+    # Dedupe and rank by frequency so the most salient keyword comes first
+    # (ties keep document order); downstream search loops short-circuit sooner.
+    counts = Counter(t for t in tokens if t not in stopwords and len(t) >= min_len)
+    return [t for t, _c in counts.most_common()]
+
+def extract_weighted_domain_ngrams(text, domain_keywords, domain_phrases):
+    global _AUTOMATON, _IDF, _VOCAB
+    if _VOCAB is None:
+        # Fallback for callers that never went through load_domain_sets.
+        _VOCAB = sorted(domain_keywords | domain_phrases)
+        _AUTOMATON, _IDF = _build_matcher(_VOCAB)
+
+    lowered = text.lower()
+    counts = np.zeros(len(_VOCAB))
+    for end, (i, term) in _AUTOMATON.iter(lowered):
+        start = end - len(term) + 1
+        # Only count whole-word/phrase matches, like the old tokenizer did.
+        if (start == 0 or not lowered[start - 1].isalnum()) and \
+           (end == len(lowered) - 1 or not lowered[end + 1].isalnum()):
+            counts[i] += 1
+
+    if not counts.sum():
+        return {}
+    scores = counts * _IDF
+    scores /= np.linalg.norm(scores) or 1.0
+    return {_VOCAB[i]: float(scores[i]) for i in np.nonzero(scores)[0]}
@@ -1,9 +1,11 @@
 import requests
+from requests.adapters import HTTPAdapter
 import base64
+import codecs
 import json
+import orjson
 import time
 import pyarrow as pa
-from io import BytesIO
 import logging
 
 class OmniClient:
@@ -14,6 +16,10 @@ class OmniClient:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        # Keep-alive session so repeat calls reuse the TCP+TLS connection.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=50))
         self.log = logging.getLogger(__name__)
 
     def _poll_job(self, job_ids, timeout=30, interval=3):
@@ -21,40 +27,79 @@ class OmniClient:
         end_time = time.time() + timeout
         while time.time() < end_time:
             self.log.info("Polling Omni job(s)")
-            resp = requests.get(url, headers=self.headers, params={"job_ids": json.dumps(job_ids)})
+            resp = self.session.get(url, params={"job_ids": orjson.dumps(job_ids).decode()})
             resp.raise_for_status()
-            for obj in resp.json():
+            data = orjson.loads(resp.content)
+            for obj in data:
                 if obj.get("result", "").startswith("/////"):
                     return obj["result"]
-            time.sleep(interval)
+            # /query/wait long-polls server-side; when every job came back
+            # with its timeout marker the server already blocked for its
+            # max-wait window, so re-request immediately instead of adding
+            # a client-side sleep on top.
+            if not data or not all(obj.get("timeout") for obj in data):
+                time.sleep(interval)
         raise TimeoutError(f"Jobs {job_ids} did not complete within {timeout} seconds")
 
-    def run_query(self, query_json):
+    def _table_to_df(self, table, first_row_only):
+        if first_row_only:
+            # Convert only the row the caller will read, not all 50k.
+            table = table.slice(0, 1)
+        df = table.to_pandas()
+        self.log.info(f"Retrieved DataFrame with {df.shape[0]} rows and {df.shape[1]} columns")
+        return df
+
+    def run_query(self, query_json, first_row_only=False):
         self.log.info("Sending Omni API request")
-        resp = requests.post(f"{self.base_url}/query/run", headers=self.headers, json=query_json)
+        # Ask for raw Arrow first; servers that honor it skip the
+        # base64-in-JSON wrapping (~33% inflation) entirely.
+        # data= with pre-encoded orjson bytes; json= would re-serialize with
+        # stdlib json (Content-Type is already set on the session).
+        resp = self.session.post(
+            f"{self.base_url}/query/run",
+            data=orjson.dumps(query_json),
+            headers={"Accept": "application/vnd.apache.arrow.stream"},
+            stream=True,
+        )
         self.log.info(f"Omni response status: {resp.status_code}")
         resp.raise_for_status()
 
-        json_objects = []
-        depth = 0
-        start = 0
-        for i, ch in enumerate(resp.text):
-            if ch == '{':
-                if depth == 0:
-                    start = i
-                depth += 1
-            elif ch == '}':
-                depth -= 1
-                if depth == 0:
-                    json_objects.append(resp.text[start:i+1])
+        content_type = resp.headers.get("Content-Type", "")
+        if content_type.startswith("application/vnd.apache.arrow.stream"):
+            resp.raw.decode_content = True
+            table = pa.ipc.RecordBatchStreamReader(resp.raw).read_all()
+            return self._table_to_df(table, first_row_only)
 
+        # Fallback: a stream of concatenated JSON objects with base64-wrapped
+        # Arrow. Decode incrementally as chunks arrive (raw_decode splits and
+        # parses in one C-level pass) and stop reading the moment the
+        # Arrow-bearing object shows up, instead of materializing the whole
+        # body as one string first.
+        decoder = json.JSONDecoder()
+        utf8 = codecs.getincrementaldecoder("utf-8")()
+        buf = ""
         arrow_data, job_ids = None, []
-        for obj in map(json.loads, json_objects):
-            if obj.get("result", "").startswith("/////"):
-                arrow_data = base64.b64decode(obj["result"])
+        for chunk in resp.iter_content(chunk_size=65536):
+            buf += utf8.decode(chunk)
+            idx = 0
+            while idx < len(buf):
+                while idx < len(buf) and buf[idx].isspace():
+                    idx += 1
+                if idx >= len(buf):
+                    break
+                try:
+                    obj, idx = decoder.raw_decode(buf, idx)
+                except ValueError:
+                    break  # incomplete object; wait for the next chunk
+                if obj.get("result", "").startswith("/////"):
+                    arrow_data = base64.b64decode(obj["result"])
+                    break
+                if "remaining_job_ids" in obj:
+                    job_ids.extend(obj["remaining_job_ids"])
+            if arrow_data:
                 break
-            if "remaining_job_ids" in obj:
-                job_ids.extend(obj["remaining_job_ids"])
+            buf = buf[idx:]  # drop consumed prefix to bound memory
+        resp.close()
 
         if not arrow_data and job_ids:
             arrow_data = base64.b64decode(self._poll_job(job_ids))
@@ -62,9 +107,6 @@ class OmniClient:
         if not arrow_data:
             raise Exception("Arrow table not found")
 
-        with BytesIO(arrow_data) as buffer:
-            table = pa.ipc.RecordBatchStreamReader(buffer).read_all()
-            df = table.to_pandas()
-
-        self.log.info(f"Retrieved DataFrame with {df.shape[0]} rows and {df.shape[1]} columns")
-        return df
+        # Zero-copy read straight off the decoded bytes; no BytesIO wrapper.
+        table = pa.ipc.open_stream(pa.py_buffer(arrow_data)).read_all()
+        return self._table_to_df(table, first_row_only)
@@ -1,27 +1,86 @@
 # pylon_client.py
+import heapq
 import logging
+import re
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict, Optional, Tuple
-from bs4 import BeautifulSoup
+from cachetools import TTLCache
+
+# Matches link-worthy values in one pass instead of lower()+startswith+in.
+_URL_RE = re.compile(r"^https?://|omniapp\.co", re.IGNORECASE)
+
+# Good enough for n-gram seeding; a full HTML parse is overkill for a
+# 200-char plain-text preview.
+_TAG_RE = re.compile(r"<[^>]+>")
+
+def _html_preview(body_html: str, limit: int) -> str:
+    """Tag-stripped text preview that stops scanning once `limit` chars
+    are collected, instead of stripping the entire body first."""
+    parts: List[str] = []
+    size = 0
+    pos = 0
+    for m in _TAG_RE.finditer(body_html):
+        chunk = body_html[pos:m.start()]
+        parts.append(chunk)
+        parts.append(" ")
+        size += len(chunk) + 1
+        pos = m.end()
+        if size >= limit:
+            break
+    else:
+        parts.append(body_html[pos:])
+    return "".join(parts)[:limit]
+
+# Column labels are static per column name; compute each at most once.
+_LABEL_CACHE: Dict[str, str] = {}
+
+def _label(col: str) -> str:
+    label = _LABEL_CACHE.get(col)
+    if label is None:
+        label = col.replace("_", " ").title()
+        _LABEL_CACHE[col] = label
+    return label
 
 class PylonClient:
     def __init__(self, api_key: str, base_url: str = "https://api.usepylon.com/"):
         self.base_url = base_url.rstrip("/")
         self.headers = {
             "Content-Type": "application/json",
+            "Accept-Encoding": "gzip, deflate, br",
             "Authorization": f"Bearer {api_key}",
         }
+        # Keep-alive session so repeat calls reuse the TCP+TLS connection.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        retries = Retry(
+            total=3,
+            backoff_factor=1.0,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "POST"],
+            respect_retry_after_header=True,
+        )
+        self.session.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=retries))
         self.log = logging.getLogger(__name__)
+        # Issue bodies barely change within a support session; serve repeat
+        # fetches locally for a few minutes. Errors/misses are never cached.
+        self._body_cache = TTLCache(maxsize=1024, ttl=300)
 
     def get_issue_body_html(self, issue_id: str) -> Optional[str]:
+        cached = self._body_cache.get(issue_id)
+        if cached is not None:
+            return cached
         url = f"{self.base_url}/issues/{issue_id}"
         self.log.info(f"Fetching Pylon issue: {issue_id}")
         try:
-            resp = requests.get(url, headers=self.headers, timeout=10)
+            resp = self.session.get(url, timeout=10)
             resp.raise_for_status()
-            body_html = resp.json().get("data", {}).get("body_html")
+            body_html = orjson.loads(resp.content).get("data", {}).get("body_html")
             if body_html:
                 self.log.info(f"Issue {issue_id} body_html found")
+                self._body_cache[issue_id] = body_html
             else:
                 self.log.warning(f"Issue {issue_id} has no body_html")
             return body_html
@@ -31,6 +90,9 @@ class PylonClient:
             self.log.exception(f"Failed to fetch issue {issue_id}")
         return None
 
+    def close(self) -> None:
+        self.session.close()
+
 
 class PylonComponents:
     """
@@ -41,6 +103,9 @@ class PylonComponents:
 
     def __init__(self, logger: Optional[logging.Logger] = None):
         self.log = logger or logging.getLogger(__name__)
+        # Issue bodies change rarely but widgets re-render often; skip the
+        # whole fetch/parse/search pipeline on repeat renders for a while.
+        self._doc_links_cache = TTLCache(maxsize=2048, ttl=600)
 
     # ---- Base component builders ----
     @staticmethod
@@ -54,10 +119,11 @@ class PylonComponents:
 
     @staticmethod
     def _normalize_url(url: str) -> str:
-        # Keep scheme if present; otherwise default to https.
-        if not url.lower().startswith(("http://", "https://")):
-            return "https://" + url.lstrip("/")
-        return url
+        # Keep scheme if present; otherwise default to https. Only the first
+        # 8 chars can hold the scheme, so don't lowercase the whole URL.
+        if url[:8].lower().startswith(("http://", "https://")):
+            return url
+        return "https://" + url.lstrip("/")
 
     # ---- Issue-driven related-docs ----
     def issue_related_docs(
@@ -79,34 +145,59 @@ class PylonComponents:
         """
         components: List[Dict] = []
 
+        cached = self._doc_links_cache.get(issue_id)
+        if cached is not None:
+            return list(cached)
+
         body_html = pylon_client.get_issue_body_html(issue_id)
         if not body_html:
             return components
 
-        text = BeautifulSoup(body_html, "html.parser").get_text()[:preview_chars]
+        text = _html_preview(body_html, preview_chars)
+        # Near-empty bodies can't produce a meaningful signal; don't bother
+        # scoring (or searching) them.
+        if len(text.split()) < 2:
+            self._doc_links_cache[issue_id] = []
+            return components
+
         weighted = extract_weighted_domain_ngrams(text, domain_keywords, domain_phrases)
+        # No signal at all means no candidates; skip ranking and search.
+        if not weighted or max(weighted.values()) < min_signal_weight:
+            self._doc_links_cache[issue_id] = []
+            return components
 
-        # Sort phrases by weight descending; filter out weak signals if configured
-        ranked: List[Tuple[str, float]] = sorted(
+        # Keep only the top candidates by weight (bounded heap, no full sort);
+        # filter out weak signals if configured. On equal weight, prefer
+        # multi-word phrases — they search far more precisely than unigrams.
+        ranked: List[Tuple[str, float]] = heapq.nlargest(
+            max_links * 2,
             ((p, w) for p, w in weighted.items() if w >= min_signal_weight),
-            key=lambda x: -x[1],
+            key=lambda x: (x[1], x[0].count(" ")),
         )
 
-        for phrase, _w in ranked:
-            try:
-                # Expecting (title, url) or None per your Typesense client
-                result = typesense_client.search_docs(phrase)
-                if result:
-                    title, url = result
-                    components.append(
-                        self.link(label=f"Related Documentation: {title}", url=url)
-                    )
-                if len(components) >= max_links:
-                    break
-            except Exception:
-                self.log.exception("Typesense search failed for phrase '%s'", phrase)
-                # continue to next phrase
+        # One multi-search round-trip for the candidate pool instead of
+        # N sequential HTTP calls; take the first max_links non-empty hits.
+        candidates = [phrase for phrase, _w in ranked]
+        try:
+            results = typesense_client.search_docs_batch(candidates)
+        except Exception:
+            self.log.exception("Typesense multi-search failed for %d phrase(s)", len(candidates))
+            return components
+        if results is None:
+            # Transport failure, not a miss: leave the issue uncached so the
+            # next render retries instead of showing "no docs" for the TTL.
+            return components
 
+        for result in results:
+            if result:
+                title, url = result
+                components.append(
+                    self.link(label=f"Related Documentation: {title}", url=url)
+                )
+            if len(components) >= max_links:
+                break
+
+        self._doc_links_cache[issue_id] = list(components)
         return components
 
     # ---- Omni row -> components ----
@@ -119,16 +210,40 @@ class PylonComponents:
         out: List[Dict] = []
         for col, val in row.items():
             val_str = "" if val is None else str(val)
-            label = col.replace("_", " ").title()
-            if val_str and (
-                val_str.lower().startswith(("http://", "https://"))
-                or "omniapp.co" in val_str.lower()
-            ):
+            label = _label(col)
+            if val_str and _URL_RE.search(val_str):
                 out.append(self.link(label=label, url=val_str))
             else:
                 out.append(self.text(label=label, value=val_str if val_str else "(not available)"))
         return out
 
+    def rows_to_components(self, df) -> List[List[Dict]]:
+        """
+        Convert a pandas DataFrame to one component list per row.
+
+        Unlike row_to_components, the string conversion and URL detection
+        run vectorized once per column, so cost scales with columns rather
+        than rows x columns of Python-level dispatch.
+        """
+        labels = [_label(c) for c in df.columns]
+        columns = []
+        for col in df.columns:
+            vals = df[col].astype(str).where(~df[col].isna(), "")
+            is_url = vals.str.contains(_URL_RE) & (vals != "")
+            columns.append((vals.to_numpy(), is_url.to_numpy()))
+
+        out: List[List[Dict]] = []
+        for i in range(len(df)):
+            row_out: List[Dict] = []
+            for label, (vals, is_url) in zip(labels, columns):
+                val_str = vals[i]
+                if is_url[i]:
+                    row_out.append(self.link(label=label, url=val_str))
+                else:
+                    row_out.append(self.text(label=label, value=val_str if val_str else "(not available)"))
+            out.append(row_out)
+        return out
+
     # ---- Orchestration convenience (optional) ----
     def assemble_issue_plus_row_components(
         self,
@@ -16,9 +16,9 @@ if [ -n "$NGROK_PID" ]; then
     kill -9 $NGROK_PID
 fi
 
-# Start Python app in background
+# Start Python app in background (gevent workers so blocking HTTP I/O yields)
 echo "🚀 Starting Python app..."
-python3 app.py &
+GEVENT=1 gunicorn -k gevent -w 4 --worker-connections 1000 -b 0.0.0.0:8000 app:app &
 
 # Wait for the app to boot
 sleep 2
@@ -1,48 +1,113 @@
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
+import orjson
+from cachetools import TTLCache
+
+# Hierarchy keys returned by _search_body's include_fields, highest first.
+_LVL_KEYS = ("hierarchy.lvl0", "hierarchy.lvl1", "hierarchy.lvl2")
 
 class TypesenseClient:
     def __init__(self, base_url, api_key):
         self.url = f"https://{base_url}-1.a1.typesense.net/multi_search?x-typesense-api-key={api_key}"
         self.headers = {
             "accept": "application/json, text/plain, */*",
+            "accept-encoding": "gzip, deflate, br",
             "content-type": "text/plain"
         }
+        # Keep-alive session so repeat calls reuse the TCP+TLS connection.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        retries = Retry(
+            total=3,
+            backoff_factor=1.0,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "POST"],
+            respect_retry_after_header=True,
+        )
+        self.session.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=retries))
         self.log = logging.getLogger(__name__)
+        # Docs for a phrase change rarely; repeated phrases across tickets
+        # hit this instead of the network. Misses are remembered too, but
+        # for a shorter window so new docs still surface.
+        self._cache = TTLCache(maxsize=4096, ttl=3600)
+        self._miss_cache = TTLCache(maxsize=4096, ttl=300)
 
-    def search_docs(self, keyword):
-        body = {
-            "searches": [{
-                "collection": "omni-docs",
-                "q": keyword,
-                "query_by": "hierarchy.lvl0,hierarchy.lvl1,hierarchy.lvl2,hierarchy.lvl3,hierarchy.lvl4,hierarchy.lvl5,hierarchy.lvl6,content",
-                "include_fields": "hierarchy.lvl0,hierarchy.lvl1,content,url",
-                "group_by": "url",
-                "group_limit": 3
-            }]
+    def _search_body(self, keyword):
+        # Only the first hit of the first group is ever consumed, and the
+        # deep hierarchy levels are rarely populated: query the top levels
+        # (weighted so titles beat body text) and fetch just what we read.
+        return {
+            "collection": "omni-docs",
+            "q": keyword,
+            "query_by": "hierarchy.lvl0,hierarchy.lvl1,hierarchy.lvl2,content",
+            "query_by_weights": "4,3,2,1",
+            "include_fields": "hierarchy.lvl0,hierarchy.lvl1,hierarchy.lvl2,url",
+            "group_by": "url",
+            "group_limit": 1,
+            "per_page": 1
         }
+
+    def _parse_result(self, result):
+        for group in result.get("grouped_hits", []):
+            hits = group.get("hits", [])
+            if not hits:
+                continue
+            doc = hits[0]["document"]
+            title_parts = [v for k in _LVL_KEYS if (v := doc.get(k))]
+            title = " > ".join(title_parts) if title_parts else doc.get("url", "")
+            url = doc["url"]
+            if not url.startswith("http"):
+                url = "https://docs.omni.co" + url
+            return title, url
+        return None
+
+    def search_docs(self, keyword):
+        results = self.search_docs_batch([keyword])
+        return results[0] if results else None
+
+    def search_docs_batch(self, keywords):
+        """Run one multi_search request for all keywords.
+
+        Returns a list aligned with `keywords`, each entry (title, url) or
+        None for a keyword with no hit — or None (not a list) when the
+        multi_search round-trip itself failed, so callers can tell a
+        transport failure from genuine misses.
+        """
+        if not keywords:
+            return []
+        # Normalized key so "Dashboard " and "dashboard" share an entry.
+        keys = [k.lower().strip() for k in keywords]
+        results = []
+        missing = []
+        for i, key in enumerate(keys):
+            hit = self._cache.get(key)
+            if hit is None and key not in self._miss_cache:
+                missing.append((i, key))
+            results.append(hit)
+        if not missing:
+            return results
+
+        # concurrency lets the server run the sub-searches in parallel.
+        body = {"concurrency": True, "searches": [self._search_body(k) for _, k in missing]}
         try:
-            resp = requests.post(self.url, headers=self.headers, data=json.dumps(body), timeout=8)
+            resp = self.session.post(self.url, data=orjson.dumps(body), timeout=8)
             resp.raise_for_status()
-            payload = resp.json()
-            results = payload.get("results", [])
-            if not results:
-                return None
-
-            for group in results[0].get("grouped_hits", []):
-                hits = group.get("hits", [])
-                if not hits:
-                    continue
-                doc = hits[0]["document"]
-                title_parts = [doc.get(f"hierarchy.lvl{i}") for i in range(7) if doc.get(f"hierarchy.lvl{i}")]
-                title = " > ".join(title_parts) if title_parts else doc.get("url", "")
-                url = doc["url"]
-                if not url.startswith("http"):
-                    url = "https://docs.omni.co" + url
-                return title, url
-
-            return None
+            payload = orjson.loads(resp.content)
+            parsed = [self._parse_result(r) for r in payload.get("results", [])]
+            # Pad in case the server returns fewer results than searches.
+            parsed.extend([None] * (len(missing) - len(parsed)))
+            for (i, k), result in zip(missing, parsed):
+                results[i] = result
+                if result:
+                    self._cache[k] = result
+                else:
+                    self._miss_cache[k] = True
         except Exception as e:
-            self.log.warning(f"[TYPESENSE] Search failed for '{keyword}': {e}")
+            self.log.warning(f"[TYPESENSE] Multi-search failed for {len(missing)} keyword(s): {e}")
             return None
+        return results
+
+    def close(self):
+        self.session.close()